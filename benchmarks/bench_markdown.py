@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-render cost of a fresh markdown.markdown() call versus
+the app's pooled, reset-between-documents converter. "pooled" empties the
+highlighted code-block cache before every render, so it measures converter
+reuse alone; "+code cache" is the app's steady state with that cache warm.
+
+Usage: python benchmarks/bench_markdown.py [iterations]
+"""
+
+import os
+import sys
+import timeit
+
+import markdown
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import BLOGS_DIR, MARKDOWN_EXTENSIONS, MARKDOWN_EXTENSION_CONFIGS, code_block_cache, render_markdown
+
+POSTS = ['array_fundamentals_en.md', 'array_fundamentals_hi.md']
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    def construct():
+        return markdown.Markdown(extensions=MARKDOWN_EXTENSIONS,
+                                 extension_configs=MARKDOWN_EXTENSION_CONFIGS)
+
+    construct_ms = min(timeit.repeat(construct, number=iterations, repeat=3)) / iterations * 1000
+    print(f"{'Markdown() construction':28s} {construct_ms:6.3f} ms (saved on every pooled render)")
+
+    for post in POSTS:
+        with open(os.path.join(BLOGS_DIR, post), 'r', encoding='utf-8') as handle:
+            text = handle.read()
+
+        def fresh():
+            return markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS,
+                                     extension_configs=MARKDOWN_EXTENSION_CONFIGS)
+
+        def pooled():
+            code_block_cache.clear()
+            return render_markdown(text)
+
+        def cached():
+            return render_markdown(text)
+
+        assert fresh() == pooled() == cached(), f"Pooled output differs for {post}"
+
+        fresh_ms = min(timeit.repeat(fresh, number=iterations, repeat=3)) / iterations * 1000
+        pooled_ms = min(timeit.repeat(pooled, number=iterations, repeat=3)) / iterations * 1000
+        cached_ms = min(timeit.repeat(cached, number=iterations, repeat=3)) / iterations * 1000
+        print(f"{post:28s} fresh {fresh_ms:6.3f} ms  pooled {pooled_ms:6.3f} ms  "
+              f"saved {fresh_ms - pooled_ms:6.3f} ms ({(1 - pooled_ms / fresh_ms) * 100:4.1f}%)  "
+              f"+code cache {cached_ms:6.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
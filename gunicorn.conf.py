@@ -0,0 +1,19 @@
+"""Gunicorn settings, loaded automatically when gunicorn starts from the project root."""
+
+
+def post_worker_init(worker):
+    """Warm the worker's caches before it accepts its first request."""
+    from app import app, warmup
+
+    # WARMUP_ON_START already warmed at import time (in the master when using --preload)
+    if app.config['WARMUP_ON_START']:
+        return
+    for name, count, elapsed in warmup():
+        worker.log.info("Warmup %s: %s in %.1f ms", name, count, elapsed * 1000)
+
+
+def worker_exit(server, worker):
+    """Flush queued contact submissions before the worker goes away."""
+    from app import flush_contact_writer
+
+    flush_contact_writer()
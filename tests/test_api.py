@@ -97,6 +97,73 @@ class TestContactAPI:
         assert len(data['submissions']) >= 1
 
 
+class TestAdminContactsListing:
+    """Test pagination, filters and the NDJSON export on /admin/contacts."""
+
+    @pytest.fixture
+    def contacts(self, client, tmp_path, monkeypatch):
+        import app as app_module
+        monkeypatch.setattr(app_module, 'CONTACT_FILE', str(tmp_path / "contacts.json"))
+        app_module.init_contact_file()
+        store = app_module.contact_store()
+        for number in range(1, 6):
+            email = 'even@example.com' if number % 2 == 0 else 'odd@example.com'
+            store.append({'name': f'User {number}', 'email': email, 'subject': 's', 'message': 'm'})
+        return store
+
+    @pytest.mark.api
+    def test_cursor_pagination_newest_first(self, client, contacts):
+        """Test that following next_cursor visits every submission once, newest first."""
+        seen = []
+        url = '/admin/contacts?limit=2'
+        while url:
+            data = json.loads(client.get(url).data)
+            assert data['count'] <= 2
+            seen.extend(record['id'] for record in data['submissions'])
+            url = f"/admin/contacts?limit=2&cursor={data['next_cursor']}" if data['next_cursor'] else None
+
+        assert seen == [5, 4, 3, 2, 1]
+
+    @pytest.mark.api
+    def test_email_and_since_filters(self, client, contacts):
+        """Test the email (case-insensitive) and since filters."""
+        data = json.loads(client.get('/admin/contacts?email=EVEN@example.com').data)
+        assert [record['id'] for record in data['submissions']] == [4, 2]
+
+        data = json.loads(client.get('/admin/contacts?since=2999-01-01').data)
+        assert data['count'] == 0
+
+    @pytest.mark.api
+    def test_since_with_utc_offset(self, client, contacts):
+        """Test that an explicit offset is converted to server time before comparing."""
+        from datetime import datetime, timedelta, timezone
+        from urllib.parse import quote
+        newest = contacts.query(limit=1)[0]
+        ist = timezone(timedelta(hours=5, minutes=30))
+        since = datetime.fromisoformat(newest['timestamp']).astimezone(ist).isoformat()
+
+        data = json.loads(client.get(f'/admin/contacts?since={quote(since)}').data)
+
+        assert newest['id'] in [record['id'] for record in data['submissions']]
+
+    @pytest.mark.api
+    def test_ndjson_export(self, client, contacts, monkeypatch):
+        """Test that the export streams one JSON object per line across batch boundaries."""
+        import app as app_module
+        monkeypatch.setattr(app_module, 'CONTACTS_EXPORT_BATCH_SIZE', 2)
+        response = client.get('/admin/contacts?format=ndjson&email=odd@example.com')
+
+        assert response.is_streamed
+        assert response.mimetype == 'application/x-ndjson'
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line)['id'] for line in lines] == [5, 3, 1]
+
+    @pytest.mark.api
+    def test_invalid_listing_parameters(self, client, contacts):
+        """Test that malformed cursors and dates are rejected."""
+        assert client.get('/admin/contacts?cursor=abc').status_code == 400
+        assert client.get('/admin/contacts?since=yesterday-ish').status_code == 400
+
 class TestMoodAnalysisAPI:
     """Test mood analysis API endpoints."""
 
@@ -204,6 +271,27 @@ class TestMoodAnalysisAPI:
         # Results should be identical (from cache)
         assert result1 == result2
 
+    @pytest.mark.api
+    def test_mood_analysis_shares_cache_for_equivalent_text(self, client):
+        """Test that near-duplicate texts hit the same cache entry."""
+        from app import cache
+        hits_before = cache.stats.snapshot().get('mood_analysis', {}).get('hits', 0)
+
+        first = client.post('/api/mood-analysis',
+                            data=json.dumps({'text': 'I love this!'}),
+                            content_type='application/json')
+        second = client.post('/api/mood-analysis',
+                             data=json.dumps({'text': 'i love this !!'}),
+                             content_type='application/json')
+
+        result1 = json.loads(first.data)
+        result2 = json.loads(second.data)
+        assert result1['mood'] == result2['mood']
+        assert result1['details'] == result2['details']
+        # Raw text length is still reported per request
+        assert result2['ml_metrics']['text_length'] == len('i love this !!')
+        assert cache.stats.snapshot()['mood_analysis']['hits'] == hits_before + 1
+
 
 class TestPassPredictorAPI:
     """Test pass predictor API endpoints."""
@@ -380,3 +468,423 @@ class TestCachingIntegration:
         # Result shouldn't contain cache metadata
         assert 'cache_key' not in result
         assert 'cached' not in result
+
+
+class TestAdminMetrics:
+    """Test the Prometheus metrics endpoint."""
+
+    @pytest.mark.api
+    def test_metrics_report_cache_hits_and_misses(self, client, sample_prediction_data):
+        """Test that cache counters appear per namespace."""
+        for _ in range(2):
+            client.post('/api/pass-predict',
+                        data=json.dumps(sample_prediction_data),
+                        content_type='application/json')
+
+        response = client.get('/admin/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+
+        body = response.data.decode('utf-8')
+        assert '# TYPE portfolio_cache_hits_total counter' in body
+        assert 'portfolio_cache_hits_total{cache="results",namespace="pass_prediction"}' in body
+        assert 'portfolio_cache_entries{cache="results",namespace="pass_prediction"} 1' in body
+
+    @pytest.mark.api
+    def test_metrics_report_endpoint_latency(self, client):
+        """Test that request latency histograms are exported per endpoint."""
+        client.get('/')
+
+        body = client.get('/admin/metrics').data.decode('utf-8')
+        assert '# TYPE portfolio_request_duration_seconds histogram' in body
+        assert 'portfolio_request_duration_seconds_bucket{endpoint="home",le="+Inf"}' in body
+        assert 'portfolio_request_duration_seconds_count{endpoint="home"}' in body
+
+
+class TestConditionalRequests:
+    """Test ETag and If-None-Match handling."""
+
+    @pytest.mark.api
+    def test_page_returns_304_without_rendering(self, client):
+        """Test that an unchanged page is revalidated without rendering."""
+        first = client.get('/resume')
+        etag = first.headers['ETag']
+        assert first.status_code == 200
+
+        with patch('app.render_template') as render:
+            second = client.get('/resume', headers={'If-None-Match': etag})
+            render.assert_not_called()
+
+        assert second.status_code == 304
+        assert second.data == b''
+        assert second.headers['ETag'] == etag
+
+    @pytest.mark.api
+    def test_stale_etag_gets_full_page(self, client):
+        """Test that a non-matching validator gets a full response."""
+        response = client.get('/', headers={'If-None-Match': '"stale"'})
+        assert response.status_code == 200
+        assert b'Rishab' in response.data
+
+    @pytest.mark.api
+    def test_blog_post_etag_skips_rendering(self, client):
+        """Test that blog post validators come from file metadata."""
+        first = client.get('/api/blogs/array_fundamentals_en.md')
+        etag = first.headers['ETag']
+
+        with patch('app._render_markdown_file') as render:
+            second = client.get('/api/blogs/array_fundamentals_en.md',
+                                headers={'If-None-Match': etag})
+            render.assert_not_called()
+
+        assert second.status_code == 304
+
+    @pytest.mark.api
+    def test_blog_listing_etag(self, client):
+        """Test conditional GET on the blog listing."""
+        first = client.get('/api/blogs')
+        second = client.get('/api/blogs', headers={'If-None-Match': first.headers['ETag']})
+        assert first.status_code == 200
+        assert second.status_code == 304
+
+    @pytest.mark.api
+    def test_weak_etag_from_proxy_matches(self, client):
+        """Test that a W/ tag (as nginx sends after gzipping) still revalidates."""
+        etag = client.get('/api/blogs').headers['ETag']
+        response = client.get('/api/blogs', headers={'If-None-Match': f'W/{etag}'})
+
+        assert response.status_code == 304
+        assert response.headers['ETag'] == f'W/{etag}'
+
+
+class TestStaticAssets:
+    """Test precompressed static asset serving."""
+
+    @pytest.mark.api
+    @pytest.mark.parametrize('encoding', ['br', 'gzip'])
+    def test_serves_precompressed_variant(self, client, encoding):
+        """Test that the negotiated precompressed variant is served."""
+        import gzip
+        import brotli
+        from app import app as flask_app
+
+        response = client.get('/static/css/main_blue_theme.css',
+                              headers={'Accept-Encoding': encoding})
+
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == encoding
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert response.mimetype == 'text/css'
+
+        decompress = brotli.decompress if encoding == 'br' else gzip.decompress
+        with open(f'{flask_app.static_folder}/css/main_blue_theme.css', 'rb') as handle:
+            assert decompress(response.data) == handle.read()
+
+    @pytest.mark.api
+    def test_identity_clients_get_original_file(self, client):
+        """Test that clients without compression support get the raw file."""
+        response = client.get('/static/js/main.js', headers={'Accept-Encoding': 'identity'})
+
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
+
+    @pytest.mark.api
+    def test_templates_emit_content_hashed_urls(self, client):
+        """Test that url_for adds the manifest hash to static URLs."""
+        from app import STATIC_MANIFEST
+
+        digest = STATIC_MANIFEST['css/main_blue_theme.css']
+        response = client.get('/')
+        assert f'/static/css/main_blue_theme.css?v={digest}'.encode() in response.data
+
+    @pytest.mark.api
+    def test_only_versioned_urls_are_immutable(self, client):
+        """Test that long-lived immutable caching requires a matching hash."""
+        from app import STATIC_MANIFEST
+
+        digest = STATIC_MANIFEST['js/main.js']
+        versioned = client.get(f'/static/js/main.js?v={digest}')
+        unversioned = client.get('/static/js/main.js')
+        stale = client.get('/static/js/main.js?v=0000')
+
+        assert versioned.cache_control.immutable
+        assert versioned.cache_control.max_age == 2592000
+        assert not versioned.cache_control.no_cache
+        for response in (unversioned, stale):
+            assert not response.cache_control.immutable
+            assert response.cache_control.max_age == 3600
+
+
+class TestPageRenderCache:
+    """Test the full-page render cache."""
+
+    @pytest.mark.api
+    def test_page_is_rendered_once(self, client):
+        """Test that repeated requests are served without rendering."""
+        from app import page_cache
+
+        page_cache.clear()
+        first = client.get('/demo/pass-predictor')
+        with patch('app.render_template') as render:
+            second = client.get('/demo/pass-predictor')
+            render.assert_not_called()
+
+        assert first.status_code == second.status_code == 200
+        assert first.data == second.data
+
+    @pytest.mark.api
+    def test_miss_racing_a_fill_does_not_render_again(self, client):
+        """Test that a request whose lookup missed just before another render finished reuses that page."""
+        from app import page_cache
+
+        page_cache.clear()
+        first = client.get('/demo/pass-predictor')
+        real_get = page_cache.get
+        lookups = []
+
+        def racing_get(key):
+            lookups.append(key)  # the first lookup misses, as if it ran just before the fill
+            return None if len(lookups) == 1 else real_get(key)
+
+        with patch.object(page_cache, 'get', side_effect=racing_get), \
+             patch('app.render_template') as render:
+            second = client.get('/demo/pass-predictor')
+            render.assert_not_called()
+
+        assert second.data == first.data
+
+    @pytest.mark.api
+    def test_compressed_variant_matches_page(self, client):
+        """Test that the cached gzip variant decodes to the page body."""
+        import gzip
+
+        plain = client.get('/certificates', headers={'Accept-Encoding': 'identity'})
+        compressed = client.get('/certificates', headers={'Accept-Encoding': 'gzip'})
+
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(compressed.data) == plain.data
+
+    @pytest.mark.api
+    def test_template_change_invalidates_in_debug(self, app, client):
+        """Test that debug mode re-renders when the template changes."""
+        from app import page_cache
+
+        page_cache.clear()
+        client.get('/resume')
+        app.debug = True
+        try:
+            with patch('app._template_mtime', return_value=0), \
+                 patch('app.render_template', return_value='<p>edited</p>'):
+                response = client.get('/resume')
+        finally:
+            app.debug = False
+            page_cache.clear()
+
+        assert response.data == b'<p>edited</p>'
+
+
+class TestTemplatePrecompilation:
+    """Test eager template compilation at startup."""
+
+    @pytest.mark.api
+    def test_templates_are_compiled_at_startup(self, app):
+        """Test that every template is loaded and bytecode-cached."""
+        from jinja2 import FileSystemBytecodeCache
+        from app import precompile_templates
+
+        assert isinstance(app.jinja_env.bytecode_cache, FileSystemBytecodeCache)
+        assert precompile_templates() == len(app.jinja_env.list_templates())
+        cached_names = {name for _, name in app.jinja_env.cache.keys()}
+        assert {'home.html', 'demos/mood_detector.html'} <= cached_names
+
+
+class TestBlogBuild:
+    """Test the offline blog build command and artifact serving."""
+
+    @pytest.mark.api
+    def test_build_writes_index_and_html(self, runner, tmp_path, monkeypatch):
+        """Test that `flask blogs build` writes artifacts for every post."""
+        import app as app_module
+        monkeypatch.setattr(app_module, 'BLOG_ARTIFACTS', {})
+
+        result = runner.invoke(args=['blogs', 'build', '--output', str(tmp_path)])
+
+        assert result.exit_code == 0, result.output
+        with open(tmp_path / 'index.json', encoding='utf-8') as handle:
+            index = json.load(handle)
+        filenames = {post['filename'] for post in index['posts']}
+        assert {'array_fundamentals_en.md', 'array_fundamentals_hi.md'} <= filenames
+        for post in index['posts']:
+            assert (tmp_path / post['html_file']).read_text(encoding='utf-8').strip()
+
+    @pytest.mark.api
+    def test_api_serves_prebuilt_html_without_rendering(self, client, runner, tmp_path, monkeypatch):
+        """Test that built artifacts replace live Markdown rendering."""
+        import app as app_module
+        monkeypatch.setattr(app_module, 'BLOG_ARTIFACTS', {})
+        monkeypatch.setattr(app_module, 'BLOG_HTML_CACHE_DIR', str(tmp_path / 'empty_cache'))
+        runner.invoke(args=['blogs', 'build', '--output', str(tmp_path / 'build')])
+        app_module.blog_render_cache.clear()
+
+        with patch('app._render_markdown_path') as render:
+            response = client.get('/api/blogs/array_fundamentals_en.md')
+            render.assert_not_called()
+
+        data = json.loads(response.data)
+        assert response.status_code == 200
+        assert data['title'] == 'Array Fundamentals: Contiguous Storage Explained'
+        assert 'codehilite' in data['html']
+        app_module.blog_render_cache.clear()
+
+
+class TestWarmup:
+    """Test the startup warmup phase."""
+
+    @pytest.mark.api
+    def test_warmup_command_reports_each_step(self, runner, tmp_path):
+        """Test that `flask warmup` fills caches and prints per-step timings."""
+        import app as app_module
+        inputs = tmp_path / 'inputs.json'
+        inputs.write_text(json.dumps({'mood_analysis': ['I love this warm cache']}), encoding='utf-8')
+        app_module.page_cache.clear()
+
+        result = runner.invoke(args=['warmup', '--inputs', str(inputs)])
+
+        assert result.exit_code == 0, result.output
+        for step in ('templates', 'blog_index', 'blog_renders', 'pages', 'replay', 'total'):
+            assert step in result.output
+        assert app_module.page_cache.get('home') is not None
+        key = app_module.generate_text_cache_key('I love this warm cache')
+        assert app_module.cache.get(key) is not None
+
+    @pytest.mark.api
+    def test_failing_step_does_not_stop_warmup(self):
+        """Test that one failing step is reported and later steps still run."""
+        import app as app_module
+
+        with patch('app._warm_blog_renders', side_effect=OSError('disk gone')):
+            report = {name: count for name, count, _ in app_module.warmup()}
+
+        assert report['blog_renders'] is None
+        assert report['pages'] is not None
+
+
+class TestBlogStreaming:
+    """Test the streamed HTML mode of the blog content endpoint."""
+
+    @pytest.mark.api
+    def test_format_html_streams_rendered_post(self, client):
+        """Test that ?format=html streams the same HTML the JSON endpoint returns."""
+        expected = json.loads(client.get('/api/blogs/array_fundamentals_en.md').data)['html']
+        response = client.get('/api/blogs/array_fundamentals_en.md?format=html',
+                              headers={'Accept-Encoding': 'identity'})
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'text/html'
+        assert response.get_data(as_text=True) == expected
+
+    @pytest.mark.api
+    def test_streamed_gzip_decodes_per_chunk(self, client):
+        """Test that every gzip chunk is flushed so it can be decoded on arrival."""
+        import zlib
+
+        expected = json.loads(client.get('/api/blogs/array_fundamentals_en.md').data)['html']
+        response = client.get('/api/blogs/array_fundamentals_en.md?format=html',
+                              headers={'Accept-Encoding': 'gzip'}, buffered=False)
+        decoder = zlib.decompressobj(31)
+        chunks = [decoder.decompress(chunk) for chunk in response.response]
+        response.close()
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert chunks[0].startswith(b'<h1')
+        assert b''.join(chunks).decode('utf-8') == expected
+
+        etag = response.headers['ETag'].strip('"')
+        revalidated = client.get('/api/blogs/array_fundamentals_en.md?format=html',
+                                 headers={'If-None-Match': f'"{etag}"'})
+        assert revalidated.status_code == 304
+
+
+    @pytest.mark.api
+    def test_front_matter_title_is_streamed(self, client, tmp_path):
+        """Test that a post titled only in front matter still gets a heading."""
+        from app import blog_render_cache
+        blogs = tmp_path / "Blogs"
+        blogs.mkdir()
+        (blogs / "post.md").write_text("---\ntitle: Arrays & Loops\n---\nBody text.\n", encoding='utf-8')
+        blog_render_cache.clear()
+        with patch('app.BLOGS_DIR', str(blogs)), patch('app.BLOG_HTML_CACHE_DIR', str(tmp_path / "html")):
+            response = client.get('/api/blogs/post.md?format=html', headers={'Accept-Encoding': 'identity'})
+        blog_render_cache.clear()
+
+        assert response.get_data(as_text=True).startswith('<h1>Arrays &amp; Loops</h1>')
+
+    @pytest.mark.api
+    def test_brotli_only_client_is_not_buffered(self, client):
+        """Test that flask-compress does not collect the stream for clients without gzip."""
+        with patch('app.BLOG_STREAM_CHUNK_SIZE', 512):
+            response = client.get('/api/blogs/array_fundamentals_en.md?format=html',
+                                  headers={'Accept-Encoding': 'br'}, buffered=False)
+            chunks = list(response.response)
+        response.close()
+
+        assert 'Content-Encoding' not in response.headers
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert len(chunks) > 1
+        assert b''.join(chunks).startswith(b'<h1')
+
+class TestBlogSearchAPI:
+    """Test the blog search endpoint."""
+
+    @pytest.mark.api
+    def test_search_returns_ranked_posts(self, client):
+        """Test that search ranks posts and highlights matches."""
+        response = client.get('/api/blogs/search?q=contiguous')
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data['success'] is True
+        assert data['count'] >= 1
+        assert data['results'][0]['filename'] == 'array_fundamentals_en.md'
+        assert '<mark>' in data['results'][0]['snippet']
+
+    @pytest.mark.api
+    def test_search_requires_query(self, client):
+        """Test that an empty query is rejected."""
+        response = client.get('/api/blogs/search?q=')
+        assert response.status_code == 400
+        assert json.loads(response.data)['success'] is False
+
+
+class TestBlogListingAPI:
+    """Test pagination, sorting and field selection on the blog listing."""
+
+    @pytest.mark.api
+    def test_cursor_pagination_walks_every_post(self, client):
+        """Test that following next_cursor visits each post exactly once."""
+        everything = json.loads(client.get('/api/blogs').data)['posts']
+        seen = []
+        url = '/api/blogs?limit=1'
+        while url:
+            data = json.loads(client.get(url).data)
+            assert data['count'] <= 1
+            seen.extend(post['filename'] for post in data['posts'])
+            url = f"/api/blogs?limit=1&cursor={data['next_cursor']}" if data['next_cursor'] else None
+
+        assert seen == [post['filename'] for post in everything]
+
+    @pytest.mark.api
+    def test_fields_projection(self, client):
+        """Test that fields= limits the keys returned for each post."""
+        data = json.loads(client.get('/api/blogs?fields=slug,date').data)
+
+        assert data['count'] >= 1
+        assert all(set(post) == {'slug', 'date'} for post in data['posts'])
+
+    @pytest.mark.api
+    def test_invalid_listing_parameters(self, client):
+        """Test that unknown fields, sorts and cursors are rejected."""
+        assert client.get('/api/blogs?fields=password').status_code == 400
+        assert client.get('/api/blogs?sort=size').status_code == 400
+        assert client.get('/api/blogs?cursor=not-a-cursor').status_code == 400
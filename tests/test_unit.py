@@ -6,14 +6,22 @@ import pytest
 import json
 import tempfile
 import os
+import threading
+import time
 from unittest.mock import patch, Mock
 from app import (
     generate_text_cache_key, 
     generate_prediction_cache_key,
     save_contact_submission,
     init_contact_file,
-    train_pass_predictor_model
+    LRUCache,
+    SQLiteCache,
+    SingleFlight,
+    BlogIndex,
+    blog_render_cache,
+    SearchIndex
 )
+import app as app_module
 
 class TestUtilityFunctions:
     """Test utility and helper functions."""
@@ -67,29 +75,23 @@ class TestUtilityFunctions:
 
     @pytest.mark.unit
     def test_init_contact_file(self, tmp_path):
-        """Test contact file initialization."""
-        # Test with non-existent file
+        """Test contact log initialization."""
+        # Test with no legacy file and no log
         contact_file = tmp_path / "test_contacts.json"
         
         with patch('app.CONTACT_FILE', str(contact_file)):
             init_contact_file()
             
-            # File should be created with empty array
-            assert contact_file.exists()
-            
-            with open(contact_file, 'r') as f:
-                data = json.load(f)
-                assert data == []
+            # An empty log is created next to the legacy path
+            log_file = tmp_path / "test_contacts.jsonl"
+            assert log_file.exists()
+            assert log_file.read_text() == ''
 
     @pytest.mark.unit
     def test_save_contact_submission(self, tmp_path):
         """Test saving contact submissions."""
         contact_file = tmp_path / "test_contacts.json"
         
-        # Initialize with empty file
-        with open(contact_file, 'w') as f:
-            json.dump([], f)
-        
         test_data = {
             'name': 'Test User',
             'email': 'test@example.com',
@@ -98,13 +100,14 @@ class TestUtilityFunctions:
         }
         
         with patch('app.CONTACT_FILE', str(contact_file)):
+            init_contact_file()
             result = save_contact_submission(test_data)
             
             assert result is True
             
-            # Check file contents
-            with open(contact_file, 'r') as f:
-                submissions = json.load(f)
+            # Check log contents
+            with open(tmp_path / "test_contacts.jsonl", 'r') as f:
+                submissions = [json.loads(line) for line in f]
                 
             assert len(submissions) == 1
             assert submissions[0]['name'] == 'Test User'
@@ -112,10 +115,54 @@ class TestUtilityFunctions:
             assert submissions[0]['id'] == 1
             assert 'timestamp' in submissions[0]
 
+    @pytest.mark.unit
+    def test_legacy_contacts_are_migrated_once(self, tmp_path):
+        """Test migration of the legacy JSON array and ID continuation."""
+        contact_file = tmp_path / "test_contacts.json"
+        legacy = [
+            {'id': 1, 'timestamp': '2025-01-01T00:00:00', 'name': 'A', 'email': 'a@x.com', 'subject': 's', 'message': 'm'},
+            {'id': 7, 'timestamp': '2025-01-02T00:00:00', 'name': 'B', 'email': 'b@x.com', 'subject': 's', 'message': 'm'},
+        ]
+        contact_file.write_text(json.dumps(legacy))
+
+        with patch('app.CONTACT_FILE', str(contact_file)):
+            init_contact_file()
+            init_contact_file()
+            save_contact_submission({'name': 'C', 'email': 'c@x.com', 'subject': 's', 'message': 'm'})
+            records = list(app_module.contact_store())
+
+        assert records[:2] == legacy
+        assert records[2]['id'] == 8
+        assert json.loads(contact_file.read_text()) == legacy
+
+    @pytest.mark.unit
+    def test_append_does_not_read_the_log(self, tmp_path):
+        """Test that IDs come from the persisted counter, not from the log."""
+        log = app_module.ContactLog(str(tmp_path / "c.jsonl"), str(tmp_path / "c.seq"))
+        data = {'name': 'A', 'email': 'a@x.com', 'subject': 's', 'message': 'm'}
+        log.append(data)
+
+        with patch.object(app_module.ContactLog, '__iter__', side_effect=AssertionError('log was read')):
+            assert log.append(data)['id'] == 2
+
+        assert (tmp_path / "c.seq").read_text() == '2'
+
+    @pytest.mark.unit
+    def test_truncated_last_line_is_skipped(self, tmp_path):
+        """Test that a partially written record does not hide the others."""
+        path = tmp_path / "c.jsonl"
+        path.write_text('{"id": 1, "name": "A"}\n{"id": 2, "na', encoding='utf-8')
+
+        records = list(app_module.ContactLog(str(path), str(tmp_path / "c.seq")))
+
+        assert records == [{'id': 1, 'name': 'A'}]
+
     @pytest.mark.unit
     @pytest.mark.slow
     def test_train_pass_predictor_model(self):
         """Test ML model training function."""
+        from app import train_pass_predictor_model
+
         model, scaler, accuracy = train_pass_predictor_model()
         
         # Check that we get valid objects
@@ -158,6 +205,17 @@ class TestCachingFunctions:
         pred_key2 = generate_prediction_cache_key(data)
         assert pred_key1 == pred_key2
 
+    @pytest.mark.unit
+    def test_text_cache_key_is_canonicalized(self):
+        """Test that texts with the same analyzer tokens share a cache key."""
+        key1 = generate_text_cache_key("I love this!")
+        key2 = generate_text_cache_key("i love   this !!")
+        key3 = generate_text_cache_key("I love that!")
+
+        assert key1 == key2
+        assert key1 != key3
+        assert key1.startswith("mood_analysis:v2:")
+
     @pytest.mark.unit
     def test_cache_key_uniqueness(self):
         """Test that different inputs generate different cache keys."""
@@ -179,6 +237,883 @@ class TestCachingFunctions:
         assert pred_key1 != pred_key2
 
 
+class TestLRUCache:
+    """Test the bounded LRU/TTL cache engine."""
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used_entry(self):
+        """Test that the entry cap evicts the least recently used key."""
+        lru = LRUCache(max_entries=2)
+        lru.set('ns:a', 1)
+        lru.set('ns:b', 2)
+        assert lru.get('ns:a') == 1  # 'a' becomes most recently used
+        lru.set('ns:c', 3)
+
+        assert lru.get('ns:b') is None
+        assert lru.get('ns:a') == 1
+        assert lru.get('ns:c') == 3
+        assert len(lru) == 2
+
+    @pytest.mark.unit
+    def test_byte_budget_is_enforced(self):
+        """Test that the byte budget bounds total cached size."""
+        lru = LRUCache(max_entries=100, max_bytes=200)
+        for i in range(20):
+            lru.set(f'ns:{i}', 'x' * 50)
+
+        assert lru.size_bytes <= 200
+        assert lru.get('ns:19') == 'x' * 50
+        assert lru.get('ns:0') is None
+        # Values larger than the whole budget are never stored
+        assert lru.set('ns:huge', 'x' * 500) is False
+
+    @pytest.mark.unit
+    def test_oversized_value_replaces_nothing(self):
+        """Test that a rejected oversized value also drops the key's previous value."""
+        lru = LRUCache(max_entries=100, max_bytes=200)
+        lru.set('ns:key', 'old')
+
+        assert lru.set('ns:key', 'x' * 500) is False
+        assert lru.get('ns:key') is None
+        assert lru.size_bytes == 0
+
+    @pytest.mark.unit
+    def test_expired_entries_are_dropped(self):
+        """Test TTL expiry on read and by the periodic sweep."""
+        lru = LRUCache(sweep_interval=0)
+        with patch('app.time.monotonic', return_value=1000.0):
+            lru.set('ns:old', 'value', timeout=10)
+            lru.set('ns:keep', 'value', timeout=100)
+        with patch('app.time.monotonic', return_value=1011.0):
+            assert lru.get('ns:old') is None
+            lru.set('ns:new', 'value')
+            assert len(lru) == 2
+
+    @pytest.mark.unit
+    def test_sweep_removes_expired_entries_and_bytes(self):
+        """Test that the periodic sweep drops expired entries nobody reads and frees their bytes."""
+        lru = LRUCache(sweep_interval=60)
+        with patch('app.time.monotonic', return_value=1000.0):
+            lru._last_sweep = 1000.0
+            lru.set('ns:old', 'x' * 100, timeout=10)
+            lru.set('ns:keep', 'value', timeout=1000)
+            kept_bytes = lru.size_bytes - LRUCache._estimate_size('ns:old', 'x' * 100)
+        with patch('app.time.monotonic', return_value=1030.0):
+            lru.set('ns:early', 'value', timeout=1000)  # before sweep_interval: nothing swept
+            assert 'ns:old' in lru._entries
+            kept_bytes += LRUCache._estimate_size('ns:early', 'value')
+        with patch('app.time.monotonic', return_value=1061.0), \
+                patch.object(lru, '_sweep', wraps=lru._sweep) as sweep:
+            lru.set('ns:trigger', 'value', timeout=1000)
+            kept_bytes += LRUCache._estimate_size('ns:trigger', 'value')
+
+        sweep.assert_called_once_with(1061.0)
+        assert 'ns:old' not in lru._entries
+        assert len(lru) == 3
+        assert lru.size_bytes == kept_bytes
+        assert lru.stats.snapshot()['ns']['expirations'] == 1
+
+    @pytest.mark.unit
+    def test_namespace_default_timeouts(self):
+        """Test per-namespace TTL defaults."""
+        lru = LRUCache(default_timeout=5, namespace_timeouts={'slow': 100})
+        with patch('app.time.monotonic', return_value=0.0):
+            lru.set('slow:key', 1)
+            lru.set('fast:key', 2)
+        with patch('app.time.monotonic', return_value=50.0):
+            assert lru.get('slow:key') == 1
+            assert lru.get('fast:key') is None
+
+
+class TestSQLiteCache:
+    """Test the shared SQLite cache backend."""
+
+    @pytest.mark.unit
+    def test_values_are_shared_between_instances(self, tmp_path):
+        """Test that separate workers on one file share results."""
+        path = str(tmp_path / "cache.sqlite3")
+        worker_a = SQLiteCache(path)
+        worker_b = SQLiteCache(path)
+
+        worker_a.set('mood_analysis:abc', {'mood': 'Positive'})
+        assert worker_b.get('mood_analysis:abc') == {'mood': 'Positive'}
+        # The shared hit is now served from worker B's L1
+        assert worker_b.l1.get('mood_analysis:abc') == {'mood': 'Positive'}
+
+    @pytest.mark.unit
+    def test_values_survive_worker_restart(self, tmp_path):
+        """Test that a recycled worker sees entries written before restart."""
+        path = str(tmp_path / "cache.sqlite3")
+        SQLiteCache(path).set('pass_prediction:xyz', {'label': 'Pass'}, timeout=60)
+
+        assert SQLiteCache(path).get('pass_prediction:xyz') == {'label': 'Pass'}
+
+    @pytest.mark.unit
+    def test_expired_rows_are_ignored(self, tmp_path):
+        """Test that expired shared entries are not returned."""
+        path = str(tmp_path / "cache.sqlite3")
+        writer = SQLiteCache(path)
+        with patch('app.time.time', return_value=1000.0):
+            writer.set('ns:key', 'value', timeout=10)
+        with patch('app.time.time', return_value=1011.0):
+            assert SQLiteCache(path).get('ns:key') is None
+
+
+    @pytest.mark.unit
+    def test_values_are_stored_as_json(self, tmp_path):
+        """Test that rows hold JSON and that non-JSON rows are treated as misses."""
+        import pickle
+        path = str(tmp_path / "cache.sqlite3")
+        cache = SQLiteCache(path)
+        cache.set('ns:key', {'mood': 'Positive'})
+        conn = cache._connect()
+
+        assert json.loads(conn.execute("SELECT value FROM cache WHERE key = 'ns:key'").fetchone()[0]) == {'mood': 'Positive'}
+
+        conn.execute("UPDATE cache SET value = ? WHERE key = 'ns:key'", (pickle.dumps({'mood': 'Positive'}),))
+        assert SQLiteCache(path).get('ns:key') is None
+
+    @pytest.mark.unit
+    def test_default_path_is_in_cache_dir(self):
+        """Test that the shared cache file defaults to the app's own cache directory."""
+        assert os.path.dirname(app_module.app.config['CACHE_SQLITE_PATH']) == app_module.app.config['CACHE_DIR']
+
+    @pytest.mark.unit
+    def test_forked_worker_opens_its_own_connection(self, tmp_path):
+        """Test that a preloaded connection is not reused by forked workers."""
+        assert _connection_survives_fork(SQLiteCache(str(tmp_path / "cache.sqlite3")))
+
+class TestSingleFlight:
+    """Test request coalescing."""
+
+    @pytest.mark.unit
+    def test_concurrent_callers_share_one_execution(self):
+        """Test that callers for an in-flight key wait for its result."""
+        flight = SingleFlight()
+        release = threading.Event()
+        executions = []
+        results = []
+
+        def compute():
+            executions.append(1)
+            release.wait(timeout=5)
+            return {'mood': 'Positive'}
+
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do('mood_analysis:k', compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while flight.stats.snapshot().get('mood_analysis', {}).get('coalesced', 0) < 4:
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(executions) == 1
+        assert results == [{'mood': 'Positive'}] * 5
+        assert flight.stats.snapshot()['mood_analysis'] == {'executions': 1, 'coalesced': 4}
+
+    @pytest.mark.unit
+    def test_leader_rechecks_before_computing(self):
+        """Test that a new leader takes a result stored after its own cache miss."""
+        flight = SingleFlight()
+        compute = Mock(return_value='fresh')
+
+        assert flight.do('ns:key', compute, check=lambda: 'stored') == 'stored'
+        compute.assert_not_called()
+        assert flight.do('ns:key', compute, check=lambda: None) == 'fresh'
+        assert flight.stats.snapshot()['ns'] == {'executions': 1, 'coalesced': 1}
+
+    @pytest.mark.unit
+    def test_errors_propagate_and_key_is_released(self):
+        """Test that failures reach callers and do not wedge the key."""
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            flight.do('ns:key', fail)
+        assert flight.do('ns:key', lambda: 42) == 42
+
+
+class TestBlogIndex:
+    """Test the cached blog index."""
+
+    @pytest.mark.unit
+    def test_index_extracts_post_metadata(self, tmp_path):
+        """Test title, slug, word count and excerpt extraction."""
+        (tmp_path / "intro_post.md").write_text(
+            "# Hello Blog\n\n- **Author:** Me\n\n> A *short* summary.\n\n```python\nprint('x')\n```\n",
+            encoding='utf-8'
+        )
+        (tmp_path / "notes.txt").write_text("ignored", encoding='utf-8')
+
+        posts = BlogIndex(str(tmp_path)).posts()
+
+        assert len(posts) == 1
+        post = posts[0]
+        assert post['filename'] == 'intro_post.md'
+        assert post['slug'] == 'intro_post'
+        assert post['title'] == 'Hello Blog'
+        assert post['excerpt'] == 'A short summary.'
+        assert post['word_count'] == 5
+        assert post['size'] == (tmp_path / "intro_post.md").stat().st_size
+
+    @pytest.mark.unit
+    def test_only_changed_posts_are_reparsed(self, tmp_path):
+        """Test incremental rebuilds driven by mtime/size."""
+        (tmp_path / "a.md").write_text("# Alpha\n", encoding='utf-8')
+        (tmp_path / "b.md").write_text("# Beta\n", encoding='utf-8')
+        index = BlogIndex(str(tmp_path), recheck_interval=0)
+        index.posts()
+        etag = index.etag
+
+        (tmp_path / "b.md").write_text("# Beta, revised\n", encoding='utf-8')
+        with patch.object(index, '_load', wraps=index._load) as load:
+            titles = [post['title'] for post in index.posts()]
+
+        assert titles == ['Alpha', 'Beta, revised']
+        assert [call.args[0] for call in load.call_args_list] == ['b.md']
+        assert index.etag != etag
+
+    @pytest.mark.unit
+    def test_unchanged_directory_skips_scan(self, tmp_path):
+        """Test that a refresh within the recheck interval costs one stat."""
+        (tmp_path / "a.md").write_text("# Alpha\n", encoding='utf-8')
+        index = BlogIndex(str(tmp_path), recheck_interval=60)
+        index.posts()
+
+        with patch.object(index, '_scan') as scan:
+            index.posts()
+            scan.assert_not_called()
+
+    @pytest.mark.unit
+    def test_removed_posts_drop_out(self, tmp_path):
+        """Test that deleted files disappear from the index."""
+        (tmp_path / "a.md").write_text("# Alpha\n", encoding='utf-8')
+        index = BlogIndex(str(tmp_path))
+        assert len(index.posts()) == 1
+
+        (tmp_path / "a.md").unlink()
+        assert index.posts() == []
+
+    @pytest.mark.unit
+    def test_front_matter_metadata(self, tmp_path):
+        """Test that front matter overrides metadata and stays out of the body."""
+        (tmp_path / "post.md").write_text(
+            "---\ntitle: \"Custom Title\"\ndate: 2024-03-05\ntags: [arrays, c]\nlang: hi\n"
+            "summary: Short summary\n---\n# Heading\n\nBody text here.\n",
+            encoding='utf-8'
+        )
+
+        post = BlogIndex(str(tmp_path)).get('post.md')
+
+        assert post['title'] == 'Custom Title'
+        assert post['date'] == '2024-03-05'
+        assert post['tags'] == ['arrays', 'c']
+        assert post['lang'] == 'hi'
+        assert post['excerpt'] == 'Short summary'
+        assert post['word_count'] == 3
+
+    @pytest.mark.unit
+    def test_unterminated_front_matter_is_body(self, tmp_path):
+        """Test that a lone leading --- is treated as ordinary content."""
+        (tmp_path / "post.md").write_text("---\ntitle: Nope\n# Real Title\n", encoding='utf-8')
+
+        post = BlogIndex(str(tmp_path)).get('post.md')
+
+        assert post['title'] == 'Real Title'
+        assert post['tags'] == []
+
+    @pytest.mark.unit
+    def test_page_sorting_and_cursor(self, tmp_path):
+        """Test date ordering and cursor continuation from the precomputed sort keys."""
+        for name, date in (('a.md', '2024-01-01'), ('b.md', '2024-03-01'), ('c.md', '2024-02-01')):
+            (tmp_path / name).write_text(f"---\ndate: {date}\n---\n# {name}\n", encoding='utf-8')
+        index = BlogIndex(str(tmp_path))
+
+        first, cursor = index.page('date', descending=True, limit=2)
+        rest, end = index.page('date', descending=True, cursor=cursor, limit=2)
+
+        assert [post['filename'] for post in first] == ['b.md', 'c.md']
+        assert [post['filename'] for post in rest] == ['a.md']
+        assert end is None
+        assert [post['filename'] for post in index.page('date')[0]] == ['a.md', 'c.md', 'b.md']
+
+
+class TestSearchIndex:
+    """Test the blog full-text search index."""
+
+    @pytest.mark.unit
+    def test_tokenizes_devanagari_words(self):
+        """Test that matras and viramas stay inside Hindi words."""
+        terms = [term for _, _, term in SearchIndex.tokenize("ऐरे मेमोरी में स्टोर होता है। Array")]
+        assert terms == ['ऐरे', 'मेमोरी', 'में', 'स्टोर', 'होता', 'है', 'array']
+
+    @pytest.mark.unit
+    def test_bm25_ranks_denser_matches_first(self):
+        """Test BM25 ordering and removal of documents."""
+        index = SearchIndex()
+        index.add('a.md', "# Arrays\n\nArrays store values. Arrays are contiguous.")
+        index.add('b.md', "# Loops\n\nLoops repeat work over an array.")
+        index.add('c.md', "# Strings\n\nNothing relevant here.")
+
+        assert [hit['doc'] for hit in index.search('arrays')] == ['a.md']
+        assert [hit['doc'] for hit in index.search('array')] == ['a.md', 'b.md']
+        index.remove('a.md')
+        assert [hit['doc'] for hit in index.search('array')] == ['b.md']
+
+    @pytest.mark.unit
+    def test_prefix_matching(self):
+        """Test trailing and starred prefix terms."""
+        index = SearchIndex()
+        index.add('a.md', "Indexing begins at zero.")
+        index.add('b.md', "Memory layout matters.")
+
+        assert [hit['doc'] for hit in index.search('index*')] == ['a.md']
+        assert [hit['doc'] for hit in index.search('mem')] == ['b.md']
+        # Only the last term is a prefix, so 'mem' no longer matches here
+        assert [hit['doc'] for hit in index.search('mem index')] == ['a.md']
+
+    @pytest.mark.unit
+    def test_snippet_highlights_and_escapes(self):
+        """Test that snippets mark matches and escape surrounding HTML."""
+        index = SearchIndex()
+        index.add('a.md', "Use <b>tags</b> and मेमोरी together.")
+
+        snippet = index.search('मेमोरी')[0]['snippet']
+        assert '<mark>मेमोरी</mark>' in snippet
+        assert '&lt;b&gt;' in snippet
+        assert '<b>' not in snippet
+
+
+class TestBlogRenderCache:
+    """Test the in-memory and on-disk cache of rendered blog posts."""
+
+    @pytest.fixture
+    def blog_dirs(self, tmp_path):
+        blogs = tmp_path / "Blogs"
+        blogs.mkdir()
+        (blogs / "first.md").write_text("# First\n\nHello.\n", encoding='utf-8')
+        (blogs / "second.md").write_text("# Second\n\nWorld.\n", encoding='utf-8')
+        cache_dir = tmp_path / "blog_html"
+        blog_render_cache.clear()
+        with patch('app.BLOGS_DIR', str(blogs)), patch('app.BLOG_HTML_CACHE_DIR', str(cache_dir)):
+            yield blogs, cache_dir
+        blog_render_cache.clear()
+
+    @pytest.mark.unit
+    def test_post_is_rendered_once(self, blog_dirs):
+        """Test that repeated reads are served from memory."""
+        with patch('app._render_markdown_path', wraps=app_module._render_markdown_path) as render:
+            first = app_module._render_markdown_file('first.md')
+            second = app_module._render_markdown_file('first.md')
+
+        assert first == second
+        assert first[0] == 'First'
+        assert '<p>Hello.</p>' in first[1]
+        assert render.call_count == 1
+
+    @pytest.mark.unit
+    def test_fresh_worker_loads_render_from_disk(self, blog_dirs):
+        """Test that the on-disk cache survives an empty memory cache."""
+        expected = app_module._render_markdown_file('first.md')
+        blog_render_cache.clear()
+
+        with patch('app._render_markdown_path') as render:
+            assert app_module._render_markdown_file('first.md') == expected
+            render.assert_not_called()
+
+    @pytest.mark.unit
+    def test_edit_invalidates_only_that_post(self, blog_dirs):
+        """Test that changing one post re-renders just that post."""
+        blogs, cache_dir = blog_dirs
+        app_module._render_markdown_file('first.md')
+        app_module._render_markdown_file('second.md')
+
+        (blogs / "first.md").write_text("# First\n\nHello again, edited.\n", encoding='utf-8')
+        with patch('app._render_markdown_path', wraps=app_module._render_markdown_path) as render:
+            title, html = app_module._render_markdown_file('first.md')
+            app_module._render_markdown_file('second.md')
+
+        assert 'Hello again, edited.' in html
+        assert [call.args[1] for call in render.call_args_list] == ['first.md']
+        # The stale version of the edited post is removed from disk
+        assert len(list(cache_dir.iterdir())) == 2
+
+
+class TestMarkdownConverterPool:
+    """Test the per-thread Markdown converter."""
+
+    @pytest.mark.unit
+    def test_converter_is_reused_and_reset(self):
+        """Test that one converter per thread renders documents independently."""
+        import markdown
+
+        text = "# Title\n\n| a | b |\n|---|---|\n| 1 | 2 |\n\n```python\nprint('hi')\n```\n"
+        first = app_module.render_markdown(text)
+        converter = app_module._markdown_converter()
+        second = app_module.render_markdown("Just *text*.")
+
+        assert app_module._markdown_converter() is converter
+        assert first == markdown.markdown(text, extensions=app_module.MARKDOWN_EXTENSIONS,
+                                          extension_configs=app_module.MARKDOWN_EXTENSION_CONFIGS)
+        assert second == '<p>Just <em>text</em>.</p>'
+
+    @pytest.mark.unit
+    def test_each_thread_gets_its_own_converter(self):
+        """Test that converters are never shared across threads."""
+        converters = []
+        thread = threading.Thread(target=lambda: converters.append(app_module._markdown_converter()))
+        thread.start()
+        thread.join()
+
+        assert converters[0] is not app_module._markdown_converter()
+
+
+class TestCodeBlockCache:
+    """Test the content-addressed cache for highlighted code blocks."""
+
+    @pytest.mark.unit
+    def test_identical_blocks_are_highlighted_once(self):
+        """Test that a block shared by two documents is only highlighted once."""
+        import pygments
+
+        app_module.code_block_cache.clear()
+        block = "```c\nint arr[5];\n```\n"
+        with patch('markdown.extensions.codehilite.highlight', wraps=pygments.highlight) as highlight:
+            first = app_module.render_markdown("# English\n\n" + block)
+            second = app_module.render_markdown("# Hinglish\n\nAlag prose.\n\n" + block)
+
+        assert highlight.call_count == 1
+        assert first.split('</h1>')[1].strip() in second
+        app_module.code_block_cache.clear()
+
+    @pytest.mark.unit
+    def test_lexer_is_part_of_the_key(self):
+        """Test that the same code under another lexer is highlighted separately."""
+        app_module.code_block_cache.clear()
+        app_module.render_markdown("```c\nx = 1;\n```\n")
+        app_module.render_markdown("```python\nx = 1;\n```\n")
+
+        assert len(app_module.code_block_cache) == 2
+        app_module.code_block_cache.clear()
+
+    @pytest.mark.unit
+    def test_only_the_app_converter_uses_the_cache(self):
+        """Test that other Markdown instances are untouched and output matches them."""
+        import markdown
+
+        app_module.code_block_cache.clear()
+        text = "```c\nint arr[5];\n```\n\n    indented();\n"
+        plain = markdown.markdown(text, extensions=app_module.MARKDOWN_EXTENSIONS,
+                                  extension_configs=app_module.MARKDOWN_EXTENSION_CONFIGS)
+
+        assert len(app_module.code_block_cache) == 0
+        assert app_module.render_markdown(text) == plain
+        assert len(app_module.code_block_cache) == 2
+        app_module.code_block_cache.clear()
+
+
+class TestBlogImageProcessing:
+    """Test lazy-loading and intrinsic-size post-processing of blog images."""
+
+    @staticmethod
+    def _png(width, height):
+        import struct
+        return b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', width, height) + b'\x08\x06\x00\x00\x00'
+
+    @pytest.mark.unit
+    def test_local_images_get_dimensions_and_srcset(self, tmp_path, monkeypatch):
+        """Test width/height from the file header and srcset from -<width>w variants."""
+        images = tmp_path / "static" / "img"
+        images.mkdir(parents=True)
+        (images / "chart.png").write_bytes(self._png(1200, 600))
+        (images / "chart-600w.png").write_bytes(self._png(600, 300))
+
+        monkeypatch.setattr(app_module.app, 'static_folder', str(tmp_path / "static"))
+        html = app_module.process_blog_images('<p><img alt="Chart" src="/static/img/chart.png" /></p>')
+
+        assert 'loading="lazy"' in html and 'decoding="async"' in html
+        assert 'width="1200" height="600"' in html
+        assert 'srcset="/static/img/chart-600w.png 600w, /static/img/chart.png 1200w"' in html
+
+    @pytest.mark.unit
+    def test_existing_attributes_are_kept(self):
+        """Test that remote images and author-set attributes are left as written."""
+        html = app_module.process_blog_images(
+            '<img src="https://example.com/a.png" loading="eager">'
+        )
+
+        assert html == '<img src="https://example.com/a.png" loading="eager" decoding="async" />'
+
+    @pytest.mark.unit
+    def test_data_src_is_not_the_image_source(self, tmp_path, monkeypatch):
+        """Test that a lazy-load data-src is neither read as the source nor rewritten."""
+        images = tmp_path / "static" / "img"
+        images.mkdir(parents=True)
+        (images / "real.png").write_bytes(self._png(1200, 600))
+        monkeypatch.setattr(app_module.app, 'static_folder', str(tmp_path / "static"))
+
+        placeholder = app_module.process_blog_images('<img data-src="/static/img/real.png" src="/static/img/blank.gif">')
+        real = app_module.process_blog_images('<img src="/static/img/real.png" data-src="/static/img/blank.gif">')
+
+        assert 'width=' not in placeholder and 'srcset=' not in placeholder
+        assert 'data-src="/static/img/real.png" src="/static/img/blank.gif"' in placeholder
+        assert 'width="1200" height="600"' in real
+
+    @pytest.mark.unit
+    def test_gt_inside_quoted_attribute(self):
+        """Test that a '>' inside an attribute value does not end the tag."""
+        html = app_module.process_blog_images('<img alt="a > b" src=\'/x>y.png\'>')
+
+        assert html == '<img alt="a > b" src=\'/x>y.png\' loading="lazy" decoding="async" />'
+
+    @pytest.mark.unit
+    def test_jpeg_size_is_read_from_frame_header(self, tmp_path):
+        """Test that JPEG segments are skipped until the start-of-frame marker."""
+        import struct
+        jpeg = tmp_path / "photo.jpg"
+        app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+        sof0 = b'\xff\xc0' + struct.pack('>HBHH', 17, 8, 480, 640) + b'\x00' * 10
+        jpeg.write_bytes(b'\xff\xd8' + app0 + sof0 + b'\xff\xd9')
+
+        assert app_module._read_image_size(str(jpeg)) == (640, 480)
+
+
+def _append_contacts(log_path, seq_path, count, fsync):
+    """Worker for the contact stress test: append ``count`` records from 4 threads."""
+    log = app_module.ContactLog(log_path, seq_path, fsync=fsync)
+    data = {'name': 'Stress', 'email': 'stress@example.com', 'subject': 's', 'message': 'x' * 5000}
+    threads = [threading.Thread(target=lambda: [log.append(data) for _ in range(count // 4)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+
+def _check_fresh_connection(store, parent_conn):
+    """Forked child: the store must open its own SQLite connection and be able to use it."""
+    conn = store._connect()
+    assert conn is not parent_conn
+    conn.execute('SELECT 1').fetchone()
+
+
+def _connection_survives_fork(store):
+    """Open ``store``'s connection, fork, and report whether the child got a fresh working one."""
+    import multiprocessing
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        pytest.skip("needs fork")
+    child = multiprocessing.get_context('fork').Process(target=_check_fresh_connection, args=(store, store._connect()))
+    child.start()
+    child.join()
+    return child.exitcode == 0
+
+class TestContactLogConcurrency:
+    """Stress the contact log the way several gunicorn workers would."""
+
+    @pytest.mark.unit
+    @pytest.mark.slow
+    def test_parallel_appends_lose_nothing(self, tmp_path):
+        """Test that parallel writers in several processes never lose or duplicate a record."""
+        import multiprocessing
+        if app_module.fcntl is None or 'fork' not in multiprocessing.get_all_start_methods():
+            pytest.skip("needs fork and fcntl")
+
+        log_path, seq_path = str(tmp_path / "c.jsonl"), str(tmp_path / "c.seq")
+        processes, per_process = 6, 100
+        ctx = multiprocessing.get_context('fork')
+        workers = [ctx.Process(target=_append_contacts, args=(log_path, seq_path, per_process, False))
+                   for _ in range(processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert all(worker.exitcode == 0 for worker in workers)
+        with open(log_path, encoding='utf-8') as handle:
+            lines = handle.read().splitlines()
+        records = [json.loads(line) for line in lines]
+        assert len(records) == processes * per_process
+        assert sorted(record['id'] for record in records) == list(range(1, processes * per_process + 1))
+        assert (tmp_path / "c.seq").read_text() == str(processes * per_process)
+
+    @pytest.mark.unit
+    def test_append_after_torn_write(self, tmp_path):
+        """Test that a record appended after a crash mid-write stays readable."""
+        path = tmp_path / "c.jsonl"
+        path.write_text('{"id": 1, "name": "A"}\n{"id": 2, "na', encoding='utf-8')
+        (tmp_path / "c.seq").write_text('2')
+        log = app_module.ContactLog(str(path), str(tmp_path / "c.seq"), fsync=False)
+
+        log.append({'name': 'C', 'email': 'c@x.com', 'subject': 's', 'message': 'm'})
+
+        assert [record['id'] for record in log] == [1, 3]
+
+
+class TestContactStores:
+    """Test the contact storage backends behind the shared interface."""
+
+    CONTACTS = [
+        {'name': 'A', 'email': 'a@example.com', 'subject': 's', 'message': 'first'},
+        {'name': 'B', 'email': 'b@example.com', 'subject': 's', 'message': 'second'},
+        {'name': 'A', 'email': 'A@Example.com', 'subject': 's', 'message': 'third'},
+    ]
+
+    @pytest.fixture(params=['jsonl', 'sqlite'])
+    def store(self, request, tmp_path):
+        if request.param == 'jsonl':
+            store = app_module.ContactLog(str(tmp_path / "c.jsonl"), str(tmp_path / "c.seq"), fsync=False)
+        else:
+            store = app_module.SQLiteContactStore(str(tmp_path / "c.sqlite3"), fsync=False)
+        store.create()
+        return store
+
+    @pytest.mark.unit
+    def test_append_and_query(self, store):
+        """Test ID allocation, ordering and the email/since/limit filters."""
+        records = [store.append(contact) for contact in self.CONTACTS]
+
+        assert [record['id'] for record in records] == [1, 2, 3]
+        assert [record['message'] for record in store] == ['first', 'second', 'third']
+        assert [record['message'] for record in store.query(limit=2)] == ['third', 'second']
+        assert [record['message'] for record in store.query(email='a@example.com')] == ['third', 'first']
+        assert [record['id'] for record in store.query(since=records[1]['timestamp'])] == [3, 2]
+        assert set(records[0]) == {'id', 'timestamp', 'name', 'email', 'subject', 'message'}
+
+    @pytest.mark.unit
+    def test_query_before_id(self, store):
+        """Test that before_id pages backwards through the filtered results."""
+        for contact in self.CONTACTS:
+            store.append(contact)
+
+        assert [record['id'] for record in store.query(before_id=3)] == [2, 1]
+        assert [record['id'] for record in store.query(email='a@example.com', before_id=3, limit=5)] == [1]
+        assert store.query(before_id=1) == []
+
+    @pytest.mark.unit
+    def test_since_survives_clock_stepping_back(self, store):
+        """Test that a record written after the clock went back does not hide older matches."""
+        records = [store.append(contact) for contact in self.CONTACTS]
+        stamps = {records[0]['id']: '2025-01-02T00:00:00', records[1]['id']: '2025-01-03T00:00:00',
+                  records[2]['id']: '2025-01-01T00:00:00'}
+        if isinstance(store, app_module.ContactLog):
+            lines = [dict(record, timestamp=stamps[record['id']]) for record in store]
+            with open(store.path, 'w', encoding='utf-8') as handle:
+                handle.writelines(json.dumps(record) + '\n' for record in lines)
+        else:
+            store._connect().executemany('UPDATE contacts SET timestamp = ? WHERE id = ?',
+                                         [(stamp, record_id) for record_id, stamp in stamps.items()])
+
+        assert [record['id'] for record in store.query(since='2025-01-02T00:00:00')] == [2, 1]
+        assert [record['id'] for record in store.query(email='a@example.com', since='2025-01-02')] == [1]
+
+    @pytest.mark.unit
+    def test_jsonl_index_reads_only_new_lines(self, tmp_path):
+        """Test that the offset index follows appends, skips torn lines and resets on replacement."""
+        log = app_module.ContactLog(str(tmp_path / "c.jsonl"), str(tmp_path / "c.seq"), fsync=False)
+        log.create()
+        log.append(self.CONTACTS[0])
+        assert [record['id'] for record in log.query()] == [1]
+
+        with open(log.path, 'ab') as handle:
+            handle.write(b'{"id": 2, "trunc')
+        assert [record['id'] for record in log.query()] == [1]
+        log.append(self.CONTACTS[1])
+        assert [record['message'] for record in log.query()] == ['second', 'first']
+        assert log.index().ids == [1, 2]
+
+        os.remove(log.path)
+        assert log.migrate_from([{'id': 7, 'timestamp': 't', **self.CONTACTS[2]}]) == 1
+        assert [record['id'] for record in log.query()] == [7]
+
+    @pytest.mark.unit
+    def test_sqlite_uses_indexes(self, tmp_path):
+        """Test that admin lookups are index searches, not table scans."""
+        store = app_module.SQLiteContactStore(str(tmp_path / "c.sqlite3"), fsync=False)
+        store.create()
+        conn = store._connect()
+
+        by_email = conn.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM contacts WHERE email = ? COLLATE NOCASE ORDER BY id DESC', ('a',)
+        ).fetchall()
+        since = conn.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM contacts WHERE timestamp >= ?', ('2025',)
+        ).fetchall()
+
+        assert 'contacts_email' in ' '.join(row['detail'] for row in by_email)
+        assert 'contacts_timestamp' in ' '.join(row['detail'] for row in since)
+
+    @pytest.mark.unit
+    def test_sqlite_store_reconnects_after_fork(self, tmp_path):
+        """Test that a connection opened by init_contact_file in the master is not reused by workers."""
+        store = app_module.SQLiteContactStore(str(tmp_path / "c.sqlite3"), fsync=False)
+        store.create()
+        assert _connection_survives_fork(store)
+
+    @pytest.mark.unit
+    def test_sqlite_backend_imports_the_jsonl_log(self, tmp_path, monkeypatch):
+        """Test that switching to SQLite keeps earlier submissions and their IDs."""
+        contact_file = tmp_path / "contacts.json"
+        monkeypatch.setattr(app_module, 'CONTACT_FILE', str(contact_file))
+        init_contact_file()
+        save_contact_submission(self.CONTACTS[0])
+        save_contact_submission(self.CONTACTS[1])
+
+        monkeypatch.setitem(app_module.app.config, 'CONTACT_BACKEND', 'sqlite')
+        monkeypatch.setitem(app_module.app.config, 'CONTACT_SQLITE_PATH', str(tmp_path / "contacts.sqlite3"))
+        init_contact_file()
+        assert save_contact_submission(self.CONTACTS[2]) is True
+
+        assert [record['id'] for record in app_module.contact_store()] == [1, 2, 3]
+
+
+    @pytest.mark.unit
+    def test_unusable_sqlite_store_does_not_crash_startup(self, tmp_path, monkeypatch):
+        """Test that a corrupt contact database is reported, not raised, and saves fail cleanly."""
+        database = tmp_path / "contacts.sqlite3"
+        database.write_bytes(b'this is not a database' * 100)
+        monkeypatch.setattr(app_module, 'CONTACT_FILE', str(tmp_path / "contacts.json"))
+        monkeypatch.setitem(app_module.app.config, 'CONTACT_BACKEND', 'sqlite')
+        monkeypatch.setitem(app_module.app.config, 'CONTACT_SQLITE_PATH', str(database))
+
+        init_contact_file()
+
+        assert save_contact_submission(self.CONTACTS[0]) is False
+
+class TestContactWriter:
+    """Test the write-behind queue in front of the contact store."""
+
+    CONTACT = {'name': 'A', 'email': 'a@example.com', 'subject': 's', 'message': 'm'}
+
+    @pytest.mark.unit
+    def test_burst_is_group_committed(self, tmp_path):
+        """Test that concurrent submissions share writes and are all durable when acknowledged."""
+        store = app_module.ContactLog(str(tmp_path / "c.jsonl"), str(tmp_path / "c.seq"), fsync=False)
+        writer = app_module.ContactWriter(batch_size=50, flush_interval=0.05)
+        results = []
+
+        with patch.object(store, 'append_many', wraps=store.append_many) as append_many:
+            threads = [threading.Thread(target=lambda: results.append(writer.submit(store, self.CONTACT)))
+                       for _ in range(40)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        writer.close()
+
+        assert results == [True] * 40
+        assert append_many.call_count < 40
+        assert sorted(record['id'] for record in store) == list(range(1, 41))
+
+    @pytest.mark.unit
+    def test_close_flushes_acknowledged_on_enqueue(self, tmp_path):
+        """Test that ack-on-enqueue submissions are written by the shutdown flush."""
+        store = app_module.ContactLog(str(tmp_path / "c.jsonl"), str(tmp_path / "c.seq"), fsync=False)
+        writer = app_module.ContactWriter(flush_interval=30)
+
+        assert all(writer.submit(store, self.CONTACT, wait=False) for _ in range(3))
+        writer.close()
+
+        assert len(list(store)) == 3
+        assert writer.submit(store, self.CONTACT) is False
+
+    @pytest.mark.unit
+    def test_submit_racing_close_is_flushed(self, tmp_path):
+        """Test that a submission already past the closed check is flushed, not left behind the sentinel."""
+        store = app_module.ContactLog(str(tmp_path / "c.jsonl"), str(tmp_path / "c.seq"), fsync=False)
+        writer = app_module.ContactWriter(flush_interval=0)
+        put = writer._queue.put
+        entered = threading.Event()
+
+        def slow_put(item, *args, **kwargs):
+            if item is not None:
+                entered.set()
+                time.sleep(0.2)  # close() runs while this submission is mid-enqueue
+            return put(item, *args, **kwargs)
+
+        with patch.object(writer._queue, 'put', side_effect=slow_put):
+            results = []
+            submitter = threading.Thread(target=lambda: results.append(writer.submit(store, self.CONTACT, wait=False)))
+            submitter.start()
+            entered.wait(1)
+            writer.close()
+            submitter.join()
+
+        assert results == [True]
+        assert len(list(store)) == 1
+
+    @pytest.mark.unit
+    def test_no_new_writer_after_shutdown_flush(self, tmp_path, monkeypatch):
+        """Test that submissions after the shutdown flush are rejected instead of starting a writer."""
+        monkeypatch.setattr(app_module, 'CONTACT_FILE', str(tmp_path / "contacts.json"))
+        monkeypatch.setattr(app_module, '_contact_writer', None)
+        monkeypatch.setattr(app_module, '_contact_writer_stopped_pid', None)
+        init_contact_file()
+        assert save_contact_submission(self.CONTACT) is True
+
+        app_module.flush_contact_writer()
+
+        assert save_contact_submission(self.CONTACT) is False
+        assert app_module._contact_writer.closed
+        assert len(list(app_module.contact_store())) == 1
+
+    @pytest.mark.unit
+    def test_timed_out_submission_is_not_written_later(self, tmp_path):
+        """Test that a submission reported as failed after a queue timeout is cancelled, not stored."""
+        store = app_module.ContactLog(str(tmp_path / "c.jsonl"), str(tmp_path / "c.seq"), fsync=False)
+        writer = app_module.ContactWriter(flush_interval=0)
+        release = threading.Event()
+        append_many = store.append_many
+
+        def slow_append_many(items):
+            release.wait(5)
+            return append_many(items)
+
+        with patch.object(store, 'append_many', side_effect=slow_append_many):
+            first = threading.Thread(target=writer.submit, args=(store, dict(self.CONTACT, name='first')))
+            first.start()
+            time.sleep(0.05)  # the writer is now blocked inside the first batch
+            assert writer.submit(store, dict(self.CONTACT, name='second'), timeout=0.05) is False
+            release.set()
+            first.join()
+            writer.close()
+
+        assert [record['name'] for record in store] == ['first']
+
+    @pytest.mark.unit
+    def test_timeout_during_write_reports_the_write(self, tmp_path):
+        """Test that a submission whose batch is already being written reports that write's outcome."""
+        store = app_module.ContactLog(str(tmp_path / "c.jsonl"), str(tmp_path / "c.seq"), fsync=False)
+        writer = app_module.ContactWriter(flush_interval=0)
+        append_many = store.append_many
+
+        def slow_append_many(items):
+            time.sleep(0.2)
+            return append_many(items)
+
+        with patch.object(store, 'append_many', side_effect=slow_append_many):
+            assert writer.submit(store, self.CONTACT, timeout=0.05) is True
+        writer.close()
+
+        assert len(list(store)) == 1
+
+    @pytest.mark.unit
+    def test_store_failure_is_reported(self, tmp_path):
+        """Test that a failed batch write is not acknowledged as saved."""
+        store = app_module.ContactLog(str(tmp_path / "missing" / "c.jsonl"), str(tmp_path / "c.seq"))
+        writer = app_module.ContactWriter(flush_interval=0)
+
+        assert writer.submit(store, self.CONTACT) is False
+        writer.close()
+
+
 class TestDataValidation:
     """Test data validation and edge cases."""
 